@@ -0,0 +1,135 @@
+# cython: language_level=3
+# ==============================================================================
+# AHEAD-OF-TIME COMPILED SIMULATION KERNEL
+# ==============================================================================
+# Typed Cython port of rrsp_core._run_sim. Same inputs, same outputs, same
+# bracket math, but compiled once at install time instead of JIT-compiled by
+# Numba on first use, so there is no warm-up and no runtime dependency.
+#
+# Build in place with:  python setup.py build_ext --inplace
+# rrsp_core picks this module up automatically once it has been built.
+
+cimport cython
+import numpy as np
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef tuple run_sim(const double[:, :] income_path, const double[:] thresholds_desc,
+                    const double[:] rates_desc, optimizable,
+                    const double[:] savings_rate_gross, const double[:] employer_match_rate,
+                    const double[:] risk_free_rate, const double[:] accumulated_room0,
+                    const double[:] annual_max_path):
+    """
+    Simulates the contribution strategy for every scenario and year of income_path.
+    See rrsp_core._run_sim for the inputs; returns the same tuple of (P, T) arrays.
+    """
+    cdef Py_ssize_t P = income_path.shape[0]
+    cdef Py_ssize_t T = income_path.shape[1]
+    cdef Py_ssize_t B = thresholds_desc.shape[0]
+    cdef Py_ssize_t p, i, b
+    cdef const unsigned char[:, :] opt = np.ascontiguousarray(optimizable, dtype=np.uint8)
+
+    contribution_arr = np.empty((P, T))
+    match_arr = np.empty((P, T))
+    invested_arr = np.empty((P, T))
+    room_available_arr = np.empty((P, T))
+    room_left_arr = np.empty((P, T))
+    tax_savings_arr = np.empty((P, T))
+    extra_arr = np.empty((P, T))
+    rrsp_bal_arr = np.empty((P, T))
+
+    cdef double[:, :] contribution = contribution_arr
+    cdef double[:, :] match = match_arr
+    cdef double[:, :] invested = invested_arr
+    cdef double[:, :] room_available = room_available_arr
+    cdef double[:, :] room_left = room_left_arr
+    cdef double[:, :] tax_savings = tax_savings_arr
+    cdef double[:, :] extra = extra_arr
+    cdef double[:, :] rrsp_bal = rrsp_bal_arr
+
+    cdef double accumulated_room, rrsp_balance
+    cdef double income, base_contribution, total_room_available
+    cdef double total_user_contribution, cash_remaining, room_remaining
+    cdef double income_after_base, current_taxable_income, cap
+    cdef double above_gross, above_after_base, above_taxable
+    cdef double prev_gross, prev_after_base, prev_taxable
+    cdef double band_base, band_extra, optimizable_so_far, filled, prev_filled
+    cdef double extra_contribution, tax_savings_year, total_inflow
+
+    # Scenarios are independent; within one, only the room carry-forward and
+    # the RRSP balance depend on the previous year.
+    for p in range(P):
+        accumulated_room = accumulated_room0[p]
+        rrsp_balance = 0.0
+        for i in range(T):
+            income = income_path[p, i]
+
+            # Total Room = Old Room carried forward + New Room (18% of income, capped)
+            total_room_available = accumulated_room + min(income * 0.18, annual_max_path[i])
+
+            # Employer Match: your mandatory contribution is the same amount
+            base_contribution = income * employer_match_rate[p]
+            match[p, i] = base_contribution
+
+            # Pay for the mandatory match first using our cash
+            total_user_contribution = base_contribution
+            cash_remaining = income * savings_rate_gross[p] - total_user_contribution
+            room_remaining = total_room_available - total_user_contribution
+            cap = max(min(room_remaining, cash_remaining), 0.0)
+
+            income_after_base = income - min(total_user_contribution, total_room_available)
+            current_taxable_income = income - total_user_contribution
+
+            # One pass over the brackets (Top -> Bottom): the mandatory contribution
+            # is the income that leaves each bracket, and the extra fills the high
+            # brackets of the remaining taxable income until Room or Cash runs out.
+            prev_gross = 0.0
+            prev_after_base = 0.0
+            prev_taxable = 0.0
+            optimizable_so_far = 0.0
+            prev_filled = 0.0
+            extra_contribution = 0.0
+            tax_savings_year = 0.0
+            for b in range(B):
+                above_gross = max(income - thresholds_desc[b], 0.0)
+                above_after_base = max(income_after_base - thresholds_desc[b], 0.0)
+                above_taxable = max(current_taxable_income - thresholds_desc[b], 0.0)
+
+                band_base = (above_gross - prev_gross) - (above_after_base - prev_after_base)
+
+                if opt[p, b]:
+                    optimizable_so_far += above_taxable - prev_taxable
+                filled = min(optimizable_so_far, cap)
+                band_extra = filled - prev_filled
+
+                extra_contribution += band_extra
+                tax_savings_year += (band_base + band_extra) * rates_desc[b]
+
+                prev_gross = above_gross
+                prev_after_base = above_after_base
+                prev_taxable = above_taxable
+                prev_filled = filled
+
+            total_user_contribution += extra_contribution
+
+            # Final safety check against room limits
+            if total_user_contribution > total_room_available:
+                total_user_contribution = total_room_available
+
+            # Update Balances for next year
+            accumulated_room = total_room_available - total_user_contribution
+            total_inflow = total_user_contribution + base_contribution
+            rrsp_balance = (rrsp_balance * (1 + risk_free_rate[p])) + total_inflow
+            rrsp_bal[p, i] = rrsp_balance
+
+            contribution[p, i] = total_user_contribution
+            invested[p, i] = total_inflow
+            room_available[p, i] = total_room_available
+            room_left[p, i] = accumulated_room
+            tax_savings[p, i] = tax_savings_year
+            extra[p, i] = extra_contribution
+
+    return (contribution_arr, match_arr, invested_arr, room_available_arr,
+            room_left_arr, tax_savings_arr, extra_arr, rrsp_bal_arr)
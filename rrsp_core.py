@@ -0,0 +1,416 @@
+"""
+Core RRSP planning engine: Quebec + Federal bracket tables, marginal rate
+lookups and the year-by-year contribution simulation.
+
+Scripts such as RRSP.py import from here instead of keeping their own copy.
+pandas is only needed for RRSPPlan.to_dataframe() and is imported there.
+"""
+import csv
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional: without it the simulation kernel runs as plain Python.
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# ==============================================================================
+# SECTION 1: HELPER FUNCTIONS FOR TAX CALCULATIONS
+# ==============================================================================
+# These functions handle the complexity of Quebec + Federal tax brackets.
+# They are used to determine your "Marginal Tax Rate" (tax on next dollar earned).
+
+@lru_cache(maxsize=1)
+def get_combined_brackets():
+    """
+    Returns (thresholds, combined_marginal_rates) for 2026, sorted high -> low.
+    
+    HOW IT WORKS:
+    - Merges Federal and Quebec tax brackets into a unified table.
+    - Applies the "Quebec Abatement" (16.5% reduction) to the Federal rate.
+    - Returns two parallel arrays like: [258k, 181k, ...], [53%, 49%, ...]
+    - The result is cached and read-only, so repeated simulations reuse it.
+    """
+    # 2026 Federal Brackets (Estimated based on 2025 + indexation)
+    fed_brackets = [
+        (258482, 0.33),
+        (181440, 0.29),
+        (117045, 0.26),
+        (58523, 0.205),
+        (0, 0.14)
+    ]
+    
+    # 2026 Quebec Brackets (Estimated)
+    qc_brackets = [
+        (132245, 0.2575),
+        (108680, 0.24),
+        (54345, 0.19),
+        (0, 0.14)
+    ]
+
+    # Create a set of all unique thresholds from both governments
+    all_thresholds = set(f[0] for f in fed_brackets) | set(q[0] for q in qc_brackets)
+    sorted_thresholds = sorted(list(all_thresholds), reverse=True)
+    
+    thresholds = np.array(sorted_thresholds, dtype=np.float64)
+    rates = np.empty(len(sorted_thresholds))
+    
+    for i, t in enumerate(sorted_thresholds):
+        # Determine Fed Rate strictly at this threshold
+        f_rate = 0.0
+        for ft, fr in fed_brackets:
+            if t >= ft:
+                f_rate = fr
+                break
+                
+        # Determine QC Rate strictly at this threshold
+        q_rate = 0.0
+        for qt, qr in qc_brackets:
+            if t >= qt:
+                q_rate = qr
+                break
+        
+        # Calculate Combined Rate with Quebec Abatement
+        # Formula: (FedRate * (1 - 0.165)) + QcRate
+        effective_fed_rate = f_rate * (1 - 0.165)
+        combined_rate = effective_fed_rate + q_rate
+        
+        rates[i] = combined_rate
+    
+    thresholds.setflags(write=False)
+    rates.setflags(write=False)
+    return thresholds, rates
+
+def get_marginal_tax_rate(income, brackets=None):
+    """
+    Calculates your marginal rate given your current income.
+    Inputs:
+        income: Your taxable income (a single value or an array of incomes)
+        brackets: The (thresholds, rates) arrays returned by get_combined_brackets()
+                  (defaults to the cached 2026 table)
+    """
+    if brackets is None:
+        brackets = get_combined_brackets()
+    thresholds, rates = brackets
+    # np.searchsorted needs Bottom -> Top order; reversing is just a view.
+    thresholds_asc, rates_asc = thresholds[::-1], rates[::-1]
+    # Index of the highest threshold strictly below the income.
+    # Incomes at or below the lowest threshold fall back to the lowest rate.
+    idx = np.searchsorted(thresholds_asc, income, side='left') - 1
+    return rates_asc[np.maximum(idx, 0)]
+
+# ==============================================================================
+# SECTION 2: SIMULATION KERNEL
+# ==============================================================================
+# The year-by-year recursion, written with plain numbers and arrays only so
+# Numba can compile it to native code (no pandas or strings in here).
+# Every array carries one row per scenario (P), so a whole parameter grid is
+# simulated in a single call: only the years (T) are walked one at a time.
+
+@njit(cache=True, fastmath=True)
+def _income_in_bands(income, thresholds_desc):
+    """
+    Splits each scenario's income across the brackets (Top -> Bottom): how
+    much of it is taxed at each bracket's rate. (P,) -> (P, B)
+    """
+    income_above = np.maximum(income[:, None] - thresholds_desc[None, :], 0.0)
+    return np.diff(np.concatenate((np.zeros((income.shape[0], 1)), income_above), axis=1))
+
+@njit(cache=True, fastmath=True)
+def _fill_top_down(band_amounts, cap):
+    """
+    Fills the bands in order, Top -> Bottom, until 'cap' dollars are placed.
+    Returns the amount placed in each band. (P, B), (P,) -> (P, B)
+    """
+    filled = np.minimum(np.cumsum(band_amounts, axis=1), cap[:, None])
+    return np.diff(np.concatenate((np.zeros((cap.shape[0], 1)), filled), axis=1))
+
+@njit(cache=True, fastmath=True)
+def _run_sim(income_path, thresholds_desc, rates_desc, optimizable,
+             savings_rate_gross, employer_match_rate, risk_free_rate,
+             accumulated_room0, annual_max_path):
+    """
+    Simulates the contribution strategy for every scenario and year of income_path.
+    Inputs:
+        income_path: Income for each scenario and simulated year, shape (P, T)
+        thresholds_desc, rates_desc: Combined brackets as arrays, Top -> Bottom
+        optimizable: True for brackets taxed above each scenario's retirement rate, (P, B)
+        savings_rate_gross, employer_match_rate, risk_free_rate: One per scenario, (P,)
+        accumulated_room0: RRSP room carried into the first simulated year, (P,)
+        annual_max_path: CRA contribution cap for each simulated year, (T,)
+    Returns arrays (contribution, match, invested, room_available, room_left,
+    tax_savings, extra_contribution, rrsp_balance), each of shape (P, T).
+    """
+    P, T = income_path.shape
+    
+    # You earn new room equal to 18% of your earned income.
+    # (Simplified to current year for this simulation)
+    # The government caps new room (e.g. ~$32k)
+    new_room = np.minimum(income_path * 0.18, annual_max_path)
+    
+    # STEP 3A: Employer Match
+    # ALWAYS take the match. It's free money (100% return instantly).
+    # Your mandatory contribution to get the match is the same amount.
+    base_contribution = match = income_path * employer_match_rate[:, None]
+    
+    # Calculate how much cash we have available to save
+    max_user_cash = income_path * savings_rate_gross[:, None]
+    
+    contribution = np.empty((P, T))
+    invested = np.empty((P, T))
+    room_available = np.empty((P, T))
+    room_left = np.empty((P, T))
+    tax_savings = np.empty((P, T))
+    extra = np.empty((P, T))
+    rrsp_bal = np.empty((P, T))
+    
+    accumulated_room = accumulated_room0.copy()
+    rrsp_balance = np.zeros(P)
+    
+    # Only the room carry-forward and the RRSP balance depend on the previous year.
+    for i in range(T):
+        income = income_path[:, i]
+        
+        # Total Room = Old Room carried forward + New Room
+        total_room_available = accumulated_room + new_room[:, i]
+        
+        # STEP 3B: Optimization (Waterfall Strategy)
+        # Should we contribute MORE than the match?
+        # Only if our Current Tax Rate > Retirement Tax Rate.
+        
+        # Pay for the mandatory match first using our cash
+        total_user_contribution = base_contribution[:, i]
+        cash_remaining = max_user_cash[:, i] - total_user_contribution
+        room_remaining = total_room_available - total_user_contribution
+        
+        # The mandatory contribution (never more than our room) comes off the
+        # top of our income: it is the income that leaves each bracket...
+        income_after_base = income - np.minimum(total_user_contribution, total_room_available)
+        base_per_band = (
+            _income_in_bands(income, thresholds_desc)
+            - _income_in_bands(income_after_base, thresholds_desc)
+        )
+        
+        # ...then the extra fills the high brackets of our "Effective Taxable Income"
+        # (Income minus what we've already contributed), limited by Room and Cash.
+        current_taxable_income = income - total_user_contribution
+        extra_per_band = _fill_top_down(
+            _income_in_bands(current_taxable_income, thresholds_desc) * optimizable,
+            np.maximum(np.minimum(room_remaining, cash_remaining), 0.0),
+        )
+        extra_contribution = extra_per_band.sum(axis=1)
+        total_user_contribution = total_user_contribution + extra_contribution
+        
+        # Each band's share is taxed at that band's rate
+        tax_savings_year = ((base_per_band + extra_per_band) * rates_desc).sum(axis=1)
+        
+        # Final safety check against room limits
+        total_user_contribution = np.minimum(total_user_contribution, total_room_available)
+            
+        # 4. Update Balances for next year
+        accumulated_room = total_room_available - total_user_contribution
+        total_inflow = total_user_contribution + match[:, i]
+        rrsp_balance = (rrsp_balance * (1 + risk_free_rate)) + total_inflow
+        rrsp_bal[:, i] = rrsp_balance
+        
+        contribution[:, i] = total_user_contribution
+        invested[:, i] = total_inflow
+        room_available[:, i] = total_room_available
+        room_left[:, i] = accumulated_room
+        tax_savings[:, i] = tax_savings_year
+        extra[:, i] = extra_contribution
+
+    return contribution, match, invested, room_available, room_left, tax_savings, extra, rrsp_bal
+
+try:
+    # Cython build of the same kernel (python setup.py build_ext --inplace).
+    # Compiled ahead of time, so it skips Numba's first-call warm-up.
+    from _rrsp_sim import run_sim as _run_sim_compiled
+except ImportError:
+    _run_sim_compiled = None
+
+# ==============================================================================
+# SECTION 3: MAIN OPTIMIZATION SIMULATION
+# ==============================================================================
+# This is the core engine. It simulates your financial life year-by-year.
+
+@dataclass
+class RRSPPlan:
+    """
+    The simulated plan as plain NumPy arrays, one value per year.
+    For a parameter sweep every field except 'year' has one row per scenario, (P, T).
+    Values are unrounded; to_columns() / to_dataframe() format them for display.
+    """
+    year: np.ndarray
+    income: np.ndarray
+    marginal_rate: np.ndarray
+    contribution: np.ndarray
+    employer_match: np.ndarray
+    total_invested: np.ndarray
+    total_room_available: np.ndarray
+    room_left: np.ndarray
+    tax_savings: np.ndarray
+    strategy: np.ndarray
+
+    def to_columns(self):
+        """
+        Returns the display table as {column name: 1-D array}, rounded and
+        formatted. Sweeps are stacked one scenario after the other, tagged
+        by a leading "Scenario" column.
+        """
+        columns = {}
+        n_years = self.year.shape[0]
+        if self.income.ndim == 2:
+            n_scenarios = self.income.shape[0]
+            columns["Scenario"] = np.repeat(np.arange(n_scenarios), n_years)
+        else:
+            n_scenarios = 1
+
+        marginal_pct = np.round(self.marginal_rate.ravel() * 100, 1)
+        columns.update({
+            "Year": np.tile(self.year, n_scenarios),
+            "Income": self.income.ravel().round(0),
+            "Marginal Rate": np.char.add(marginal_pct.astype(str), "%"),
+            "Contribution": self.contribution.ravel().round(0),
+            "Employer Match": self.employer_match.ravel().round(0), # Match is "free" money on top
+            "Total Invested": self.total_invested.ravel().round(0),
+            "Total Room Available": self.total_room_available.ravel().round(0),
+            "RRSP Room Left": self.room_left.ravel().round(0),
+            "Tax Savings": self.tax_savings.ravel().round(0),
+            "Strategy": self.strategy.ravel()
+        })
+        return columns
+
+    def to_dataframe(self):
+        """
+        Returns the display table as a pandas DataFrame (for printing or Excel).
+        """
+        import pandas as pd
+        return pd.DataFrame(self.to_columns())
+
+def optimize_rrsp_strategy(
+    current_year=2026,
+    start_earning_year=2020,
+    current_annual_income=20000,
+    full_time_start_year=2030,
+    expected_full_time_wage=80000,
+    wage_growth_rate=0.04,
+    employer_match_rate=0.05,
+    risk_free_rate=0.05,
+    retirement_income_target=55000,     # Expected taxable income in retirement
+    savings_rate_gross=0.6             # Portion of gross income available for savings
+):
+    """
+    Builds the year-by-year RRSP plan.
+    
+    SWEEPS:
+    - current_year and full_time_start_year set the timeline and must be single years.
+    - Every other input may also be an array; they are broadcast together
+      (NumPy rules) and the whole grid is simulated in one kernel call.
+    - With only single values you get one plan (arrays of shape (T,)). With
+      arrays every field gets one row per scenario, (P, T), in flat grid order.
+    Returns an RRSPPlan; call .to_dataframe() for the printable table.
+    """
+    
+    # --- A. SETUP & CONSTANTS ---
+    rrsp_max_limit_2026 = 33810
+    limit_indexing = 0.02 # Assumed annual increase in CRA contribution limits
+    
+    # Broadcast the sweepable inputs to one flat value per scenario (P,)
+    sweep = np.broadcast_arrays(*[
+        np.asarray(x, dtype=np.float64) for x in (
+            start_earning_year, current_annual_income, expected_full_time_wage,
+            wage_growth_rate, employer_match_rate, risk_free_rate,
+            retirement_income_target, savings_rate_gross,
+        )
+    ])
+    is_sweep = sweep[0].ndim > 0
+    (start_earning_year, current_annual_income, expected_full_time_wage,
+     wage_growth_rate, employer_match_rate, risk_free_rate,
+     retirement_income_target, savings_rate_gross) = [np.ravel(x) for x in sweep]
+    P = current_annual_income.shape[0]
+    
+    # Pre-calculate unified tax brackets for use in the loop
+    combined_brackets = get_combined_brackets()
+    thresholds, rates = combined_brackets
+    
+    # Determine the benchmark: What tax rate will I pay in retirement?
+    # If I save tax at 40% now but pay 30% in retirement -> Good Deal.
+    # If I save tax at 30% now and pay 30% in retirement -> Neutral (TFSA might be better).
+    retirement_tax_rate = get_marginal_tax_rate(retirement_income_target, combined_brackets)
+    
+    # Only brackets taxed above that rate are worth optimizing.
+    # It's not worth locking money away if you don't save extra tax.
+    optimizable = rates[None, :] > retirement_tax_rate[:, None]
+    
+    # Simulation range (10 years after full time starts)
+    end_year = full_time_start_year + 10
+    years = np.arange(current_year, end_year + 1)
+    T = len(years)
+    
+    # --- B. HISTORICAL ROOM CALCULATION ---
+    # We estimate how much RRSP room you accumulated while working part-time/internships.
+    years_worked_before_now = current_year - start_earning_year
+    avg_past_income = 15000 
+    accumulated_room = (avg_past_income * 0.18) * years_worked_before_now
+
+    # --- C. INCOME & LIMIT PATHS (whole simulation at once) ---
+    # Year-over-year growth is precomputed as power vectors over the simulated
+    # years, one row per scenario: shape (P, T).
+    growth = (1.0 + wage_growth_rate)[:, None]
+    
+    # 1. Income (Simulate raises and graduation)
+    # Part-time income until full time starts, then the full-time wage growing each year.
+    if full_time_start_year >= current_year:
+        years_full_time = np.maximum(years - full_time_start_year, 0)
+        income = np.where(
+            years < full_time_start_year,
+            current_annual_income[:, None],
+            expected_full_time_wage[:, None] * growth ** years_full_time,
+        )
+    else:
+        # Already full time: the current income simply keeps growing.
+        income = current_annual_income[:, None] * growth ** (years - current_year + 1)
+    
+    # 2. Contribution Limits
+    # The government caps new room (e.g. ~$32k), indexed every year
+    annual_max = rrsp_max_limit_2026 * (1.0 + limit_indexing) ** (years - 2026)
+    
+    # --- D. MAIN YEARLY SIMULATION ---
+    run_sim = _run_sim_compiled if _run_sim_compiled is not None else _run_sim
+    (contribution, match, total_invested, room_available, room_left,
+     tax_savings, extra, rrsp_balance) = run_sim(
+        income, thresholds, rates, optimizable,
+        savings_rate_gross, employer_match_rate, risk_free_rate,
+        accumulated_room, annual_max,
+    )
+
+    # 6. Review Metrics (For display only)
+    marginal_rate = get_marginal_tax_rate(income, combined_brackets)
+    strategy = np.where(extra > 0, "Optimized", "Match + Hold")
+
+    plan = [income, marginal_rate, contribution, match, total_invested,
+            room_available, room_left, tax_savings, strategy]
+    if not is_sweep:
+        plan = [x[0] for x in plan]
+    return RRSPPlan(years, *plan)
+
+# ==============================================================================
+# SECTION 4: EXPORT
+# ==============================================================================
+
+def save_plan_csv(plan, path):
+    """
+    Writes an RRSPPlan from optimize_rrsp_strategy() to CSV, same layout as
+    plan.to_dataframe().to_csv(path, index=False) but written straight from
+    the columns with the stdlib csv writer, without pandas.
+    """
+    columns = plan.to_columns()
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns)
+        writer.writerows(zip(*[column.tolist() for column in columns.values()]))
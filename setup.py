@@ -0,0 +1,13 @@
+# Builds the optional ahead-of-time compiled simulation kernel:
+#     python setup.py build_ext --inplace
+# Without it, rrsp_core falls back to the Numba (or plain Python) kernel.
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+setup(
+    name="rrsp-contribution-plan",
+    ext_modules=cythonize(
+        [Extension("_rrsp_sim", ["_rrsp_sim.pyx"])],
+        compiler_directives={"language_level": "3"},
+    ),
+)